@@ -0,0 +1,8 @@
+from setuptools import setup
+
+setup(name='enigma',
+      version='0.1.0',
+      description='Python implementation of The Enigma and Alan Turing\'s '
+                  'British Bombe',
+      packages=['enigma'],
+      package_dir={'enigma': 'src'})
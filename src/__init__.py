@@ -0,0 +1,5 @@
+"""Python implementation of The Enigma and Alan Turing's British Bombe."""
+
+from .enigma import Enigma, FrozenPlugboard, Layer, Plugboard
+
+__all__ = ['Layer', 'Plugboard', 'FrozenPlugboard', 'Enigma']
@@ -0,0 +1,112 @@
+"""Numba kernels for Bombe-style brute-force plugboard searches.
+
+The Bombe tries many candidate plugboard wirings against a known crib.
+Each candidate is independent, so the scan is expressed as a jitted
+loop over a ``(n_configs, 256)`` ``uint8`` LUT matrix, parallelized
+across cores -- or across a GPU, one block per candidate, when a CUDA
+device is present.  Both :mod:`numpy` and :mod:`numba` are optional
+dependencies of the package and only required here.
+"""
+
+from typing import Iterable, TYPE_CHECKING
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import cuda, njit, prange, uint8
+except ImportError:
+    njit = None
+    cuda = None
+
+if TYPE_CHECKING:
+    from . import Enigma
+
+__all__ = ['build_luts', 'bombe_scan', 'bombe_scan_cuda']
+
+
+if njit is not None:
+
+    @njit(parallel=True, cache=True)
+    def _bombe_scan(ct, luts, crib, scores):
+        for k in prange(luts.shape[0]):
+            s = 0
+            for i in range(ct.size):
+                if luts[k, ct[i]] == crib[i]:
+                    s += 1
+            scores[k] = s
+
+    @cuda.jit
+    def _bombe_scan_cuda(ct, luts, crib, scores):
+        # One block per candidate: the block stages its 256-entry LUT
+        # in shared memory, threads stride over the ciphertext and the
+        # partial match counts are merged with one atomic per thread.
+        k = cuda.blockIdx.x
+        tid = cuda.threadIdx.x
+        lut = cuda.shared.array(256, uint8)
+        i = tid
+        while i < 256:
+            lut[i] = luts[k, i]
+            i += cuda.blockDim.x
+        cuda.syncthreads()
+        s = 0
+        i = tid
+        while i < ct.size:
+            if lut[ct[i]] == crib[i]:
+                s += 1
+            i += cuda.blockDim.x
+        cuda.atomic.add(scores, k, s)
+
+
+def build_luts(machines: Iterable['Enigma']) -> 'np.ndarray':
+    """Stack the 256-entry byte LUTs of candidate machines into a
+    ``(n_configs, 256)`` ``uint8`` array suitable for :func:`bombe_scan`.
+    """
+
+    if np is None:
+        raise ImportError('build_luts requires numpy')
+    return np.stack([machine._byte_lut() for machine in machines])
+
+
+def bombe_scan(ciphertext: bytes, luts: 'np.ndarray',
+               crib: bytes) -> 'np.ndarray':
+    """Score every candidate LUT by how many positions of the decrypted
+    ciphertext match the crib.
+
+    :param ciphertext: The intercepted message, lowercase bytes.
+    :param luts: ``(n_configs, 256)`` ``uint8`` LUT matrix, one row per
+        candidate configuration (see :func:`build_luts`).
+    :param crib: The guessed plaintext, same length as ``ciphertext``.
+    :return: ``int64`` array of match counts, one per candidate.
+    """
+
+    if njit is None:
+        raise ImportError('bombe_scan requires numpy and numba')
+    if len(ciphertext) != len(crib):
+        raise ValueError('ciphertext and crib must have the same length')
+    ct = np.frombuffer(ciphertext, np.uint8)
+    cr = np.frombuffer(crib, np.uint8)
+    scores = np.empty(luts.shape[0], np.int64)
+    _bombe_scan(ct, luts, cr, scores)
+    return scores
+
+
+def bombe_scan_cuda(ciphertext: bytes, luts: 'np.ndarray', crib: bytes,
+                    threads_per_block: int = 128) -> 'np.ndarray':
+    """GPU variant of :func:`bombe_scan`: one block per candidate LUT,
+    with the table staged in shared memory.  Requires a CUDA device."""
+
+    if cuda is None:
+        raise ImportError('bombe_scan_cuda requires numpy and numba')
+    if not cuda.is_available():
+        raise RuntimeError('no CUDA device available')
+    if len(ciphertext) != len(crib):
+        raise ValueError('ciphertext and crib must have the same length')
+    ct = cuda.to_device(np.frombuffer(ciphertext, np.uint8))
+    cr = cuda.to_device(np.frombuffer(crib, np.uint8))
+    d_luts = cuda.to_device(np.ascontiguousarray(luts))
+    scores = cuda.to_device(np.zeros(luts.shape[0], np.int32))
+    _bombe_scan_cuda[luts.shape[0], threads_per_block](ct, d_luts, cr, scores)
+    return scores.copy_to_host()
@@ -0,0 +1,71 @@
+/* AVX2 batch encryption: 32 bytes per iteration.
+ *
+ * vpshufb indexes 16-byte lanes, so the 26-entry table is split into
+ * two 16-byte LUTs broadcast across lanes and selected on bit 4 of the
+ * letter index.  Letter classification and case restoration follow the
+ * same scheme as the SWAR kernel: OR 0x20 to lowercase, range-compare,
+ * XOR the case bits back after substitution.
+ *
+ * Build (see Makefile):
+ *   cc -O3 -mavx2 -shared -fPIC -o src/lib_enigma_avx2.so src/_enigma_avx2.c
+ */
+
+#include <immintrin.h>
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+
+int enigma_avx2_supported(void)
+{
+    return __builtin_cpu_supports("avx2");
+}
+
+void enigma_encrypt_avx2(const uint8_t *in, uint8_t *out, size_t n,
+                         const uint8_t lut[26])
+{
+    uint8_t tbl[32];
+    memcpy(tbl, lut, 26);
+    memset(tbl + 26, 0, 6);
+    const __m128i lut_lo128 = _mm_loadu_si128((const __m128i *)tbl);
+    const __m128i lut_hi128 = _mm_loadu_si128((const __m128i *)(tbl + 16));
+    const __m256i lut_lo = _mm256_broadcastsi128_si256(lut_lo128);
+    const __m256i lut_hi = _mm256_broadcastsi128_si256(lut_hi128);
+    const __m256i lower = _mm256_set1_epi8(0x20);
+    const __m256i amin = _mm256_set1_epi8('a' - 1);
+    const __m256i zmax = _mm256_set1_epi8('z' + 1);
+    const __m256i abase = _mm256_set1_epi8('a');
+    const __m256i fifteen = _mm256_set1_epi8(15);
+    const __m256i sixteen = _mm256_set1_epi8(16);
+
+    size_t i = 0;
+    for (; i + 32 <= n; i += 32) {
+        __m256i v = _mm256_loadu_si256((const __m256i *)(in + i));
+        __m256i lo = _mm256_or_si256(v, lower);
+        /* Signed compares: bytes >= 0x80 are negative and fail ge_a. */
+        __m256i ge_a = _mm256_cmpgt_epi8(lo, amin);
+        __m256i le_z = _mm256_cmpgt_epi8(zmax, lo);
+        __m256i alpha = _mm256_and_si256(ge_a, le_z);
+        __m256i idx = _mm256_sub_epi8(lo, abase);
+        __m256i sub_lo = _mm256_shuffle_epi8(lut_lo, idx);
+        /* vpshufb zeroes bytes whose index has the high bit set, so the
+         * idx - 16 underflow for low indices is harmless: the blend
+         * below picks the low-LUT result there. */
+        __m256i sub_hi = _mm256_shuffle_epi8(lut_hi,
+                                             _mm256_sub_epi8(idx, sixteen));
+        __m256i hi_sel = _mm256_cmpgt_epi8(idx, fifteen);
+        __m256i sub = _mm256_blendv_epi8(sub_lo, sub_hi, hi_sel);
+        __m256i case_bits = _mm256_and_si256(_mm256_xor_si256(v, lo), alpha);
+        __m256i res = _mm256_xor_si256(sub, case_bits);
+        res = _mm256_blendv_epi8(v, res, alpha);
+        _mm256_storeu_si256((__m256i *)(out + i), res);
+    }
+
+    for (; i < n; ++i) {
+        uint8_t c = in[i];
+        uint8_t l = c | 0x20;
+        if (!(c & 0x80) && l >= 'a' && l <= 'z')
+            out[i] = lut[l - 'a'] ^ (c ^ l);
+        else
+            out[i] = c;
+    }
+}
@@ -0,0 +1,65 @@
+/* SWAR batch encryption for mixed-case text.
+ *
+ * Processes eight bytes per iteration: a word-wide OR with 0x20
+ * lowercases, a SWAR range check classifies letters, and the original
+ * case is restored by XOR-ing the case bits back after the per-byte
+ * table lookup.  Non-alphabetic bytes pass through unchanged.
+ *
+ * Build (see Makefile):
+ *   cc -O3 -shared -fPIC -o src/lib_enigma_swar.so src/_enigma_swar.c
+ */
+
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+
+#define ONES 0x0101010101010101ULL
+
+void enigma_encrypt_swar(const uint8_t *in, uint8_t *out, size_t n,
+                         const uint8_t lut[26])
+{
+    size_t i = 0;
+
+    for (; i + 8 <= n; i += 8) {
+        uint64_t v;
+        memcpy(&v, in + i, 8);
+
+        uint64_t lo = v | (0x20 * ONES);
+        uint64_t msb = v & (0x80 * ONES);
+        uint64_t l7 = lo & (0x7F * ONES);
+        /* Bit 7 of each byte set iff l7 >= 'a' (no cross-byte carry:
+         * 0x7F + 0x1F < 0x100) resp. l7 <= 'z' (no borrow: 0xFA > 0x7F). */
+        uint64_t ge_a = l7 + ((0x80 - 'a') * ONES);
+        uint64_t le_z = ((0x80 + 'z') * ONES) - l7;
+        uint64_t alpha = ge_a & le_z & ~msb & (0x80 * ONES);
+
+        if (alpha == 0) {
+            memcpy(out + i, &v, 8);
+            continue;
+        }
+
+        uint64_t mask = (alpha >> 7) * 0xFF;   /* 0xFF per letter byte */
+        uint64_t case_bits = (v ^ lo) & mask;  /* 0x20 per uppercase byte */
+
+        uint64_t r = 0;
+        for (int k = 0; k < 64; k += 8) {
+            uint8_t o;
+            if ((mask >> k) & 0xFF)
+                o = lut[(uint8_t)(lo >> k) - 'a'];
+            else
+                o = (uint8_t)(v >> k);
+            r |= (uint64_t)o << k;
+        }
+        r ^= case_bits;
+        memcpy(out + i, &r, 8);
+    }
+
+    for (; i < n; ++i) {
+        uint8_t c = in[i];
+        uint8_t l = c | 0x20;
+        if (!(c & 0x80) && l >= 'a' && l <= 'z')
+            out[i] = lut[l - 'a'] ^ (c ^ l);
+        else
+            out[i] = c;
+    }
+}
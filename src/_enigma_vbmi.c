@@ -0,0 +1,50 @@
+/* AVX-512 VBMI batch encryption: 64 bytes per instruction.
+ *
+ * vpermt2b gathers through a 128-byte table held in two zmm registers,
+ * which is exactly the plugboard operation: the table maps lowercase
+ * and uppercase letters through the wiring (case preserved) and every
+ * other ASCII byte to itself.  Indexing uses the low 7 bits, so bytes
+ * with the high bit set are restored afterwards with a sign-mask
+ * blend.
+ *
+ * Build (see Makefile):
+ *   cc -O3 -mavx512f -mavx512bw -mavx512vbmi -shared -fPIC \
+ *      -o src/lib_enigma_vbmi.so src/_enigma_vbmi.c
+ */
+
+#include <immintrin.h>
+#include <stddef.h>
+#include <stdint.h>
+
+int enigma_vbmi_supported(void)
+{
+    return __builtin_cpu_supports("avx512vbmi")
+        && __builtin_cpu_supports("avx512bw");
+}
+
+void enigma_encrypt_vbmi(const uint8_t *in, uint8_t *out, size_t n,
+                         const uint8_t lut[26])
+{
+    uint8_t tbl[128];
+    for (int i = 0; i < 128; ++i)
+        tbl[i] = (uint8_t)i;
+    for (int i = 0; i < 26; ++i) {
+        tbl['a' + i] = lut[i];
+        tbl['A' + i] = lut[i] - 0x20;
+    }
+    const __m512i t0 = _mm512_loadu_si512(tbl);
+    const __m512i t1 = _mm512_loadu_si512(tbl + 64);
+
+    size_t i = 0;
+    for (; i + 64 <= n; i += 64) {
+        __m512i v = _mm512_loadu_si512(in + i);
+        __m512i r = _mm512_permutex2var_epi8(t0, v, t1);
+        __mmask64 high = _mm512_movepi8_mask(v);
+        _mm512_storeu_si512(out + i, _mm512_mask_blend_epi8(high, r, v));
+    }
+
+    for (; i < n; ++i) {
+        uint8_t c = in[i];
+        out[i] = c & 0x80 ? c : tbl[c];
+    }
+}
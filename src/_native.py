@@ -0,0 +1,55 @@
+"""ctypes bindings for the optional native batch kernels.
+
+The shared libraries are built from the C sources next to this module
+(``make native`` at the repository root); when they are missing every
+binding is ``None`` and callers fall back to the portable paths.
+"""
+
+import ctypes
+import os
+
+__all__ = ['encrypt', 'encrypt_swar', 'encrypt_avx2', 'encrypt_vbmi']
+
+_HERE = os.path.dirname(__file__)
+
+
+def _load(name: str):
+    try:
+        return ctypes.CDLL(os.path.join(_HERE, name))
+    except OSError:
+        return None
+
+
+_BATCH_ARGTYPES = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_size_t,
+                   ctypes.c_char_p]
+
+
+def _bind(lib, symbol):
+    fn = getattr(lib, symbol)
+    fn.restype = None
+    fn.argtypes = _BATCH_ARGTYPES
+
+    def encrypt(buf: bytes, lut: bytes) -> bytes:
+        out = ctypes.create_string_buffer(len(buf))
+        fn(buf, out, len(buf), lut)
+        return out.raw
+
+    return encrypt
+
+
+_swar = _load('lib_enigma_swar.so')
+_avx2 = _load('lib_enigma_avx2.so')
+_vbmi = _load('lib_enigma_vbmi.so')
+
+#: Each binding encrypts ``buf`` through a 26-byte ``lut``, preserving
+#: case and passing non-letters through; ``None`` when unavailable.
+encrypt_swar = _bind(_swar, 'enigma_encrypt_swar') if _swar else None
+encrypt_avx2 = (_bind(_avx2, 'enigma_encrypt_avx2')
+                if _avx2 is not None and _avx2.enigma_avx2_supported()
+                else None)
+encrypt_vbmi = (_bind(_vbmi, 'enigma_encrypt_vbmi')
+                if _vbmi is not None and _vbmi.enigma_vbmi_supported()
+                else None)
+
+#: Fastest available batch kernel.
+encrypt = encrypt_vbmi or encrypt_avx2 or encrypt_swar
@@ -0,0 +1,354 @@
+"""The Enigma machine: substitution layers and their composition."""
+
+from abc import ABC, abstractmethod
+from array import array
+from string import ascii_lowercase
+from typing import Dict, Optional, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from . import _native
+
+__all__ = ['Layer', 'Plugboard', 'FrozenPlugboard', 'Enigma']
+
+
+def _compile_lookup(table: bytes):
+    """Generate a one-argument lookup function with ``table`` baked in
+    as a literal dict constant of the code object."""
+
+    mapping = dict(zip(ascii_lowercase, table.decode()))
+    ns: Dict[str, object] = {}
+    exec(f'def _lookup(c):\n    return {mapping!r}.get(c)', ns)
+    return ns['_lookup']
+
+
+class Layer(ABC):
+    """A single substitution layer of the machine.
+
+    A layer maps each lowercase letter to another lowercase letter and can
+    be traversed in both directions, as the electrical signal does on its
+    way to and from the reflector.
+
+    Concrete layers maintain a ``_version`` counter, bumped whenever the
+    wiring changes, so that consumers holding precomputed tables can
+    tell when to rebuild them.
+    """
+
+    # Empty slots keep subclasses free of a per-instance __dict__.
+    __slots__ = ()
+
+    #: Default for subclasses that never rewire; mutable layers shadow
+    #: it with an instance attribute they bump on every change.
+    _version = 0
+
+    @abstractmethod
+    def __call__(self, value: str, reverse: bool = False) -> str:
+        """Map a single letter through the layer.
+
+        :param value: A lowercase letter.
+        :param reverse: Whether the signal is travelling back through the
+            layer.
+        """
+
+
+class Plugboard(Layer):
+    """A plugboard (*Steckerbrett*) swaps pairs of letters before and
+    after the rotor stack.  Here it is generalized to an arbitrary
+    substitution so that it can also model a rotor in a fixed position.
+    """
+
+    __slots__ = ('_version', '_fwd', '_bwd', '_front', '_back', '_fwd_fn',
+                 '_bwd_fn')
+
+    _std_front = 'zphnmswciytqedoblrfkuvgxja'
+
+    def __init__(self,
+                 front: Optional[Union[str, Dict[str, str]]] = None) -> None:
+        self._version = 0
+        if front is None:
+            # The standard wiring is precomputed once at import; default
+            # construction shares those tables and skips the validating
+            # setter entirely.
+            self._fwd = _STD_FWD
+            self._bwd = None
+            self._front = None
+            self._back = None
+            self._fwd_fn = _STD_FWD_FN
+            self._bwd_fn = None
+        else:
+            self.front = front
+
+    @property
+    def front(self) -> Dict[str, str]:
+        """Forward mapping, as a ``dict`` keyed by lowercase letter."""
+
+        if self._front is None:
+            self._front = dict(zip(ascii_lowercase, self._fwd.decode()))
+        return self._front
+
+    @front.setter
+    def front(self, value: Union[str, Dict[str, str]]) -> None:
+        if isinstance(value, str):
+            self._set_from_str(value)
+        else:
+            self._set_from_dict(value)
+
+    def _set_from_str(self, value: str) -> None:
+        # Fast path for the common 26-letter string form: validate with
+        # C-level str predicates and encode directly, no dict round-trip.
+        if (len(value) != 26 or not value.isascii() or not value.isalpha()
+                or not value.islower() or len(set(value)) != 26):
+            raise ValueError('mapping string must be a permutation of the '
+                             'lowercase alphabet')
+        self._set_tables(value.encode())
+
+    def _set_from_dict(self, value: Dict[str, str]) -> None:
+        if set(value.keys()) != set(ascii_lowercase):
+            raise ValueError('mapping keys must be the lowercase alphabet')
+        if set(value.values()) != set(ascii_lowercase):
+            raise ValueError('mapping values must be a permutation of the '
+                             'lowercase alphabet')
+        self._set_tables(bytes(ord(value[c]) for c in ascii_lowercase))
+
+    def _set_tables(self, fwd: bytes) -> None:
+        # The working representation is a pair of 26-byte tables indexed
+        # by ``ord(letter) - ord('a')``; the dict views are rebuilt on
+        # demand, and the reverse table only on first reverse traversal
+        # -- encrypt-only users never pay for the inverse.
+        self._fwd = fwd
+        self._bwd: Optional[bytes] = None
+        self._front: Optional[Dict[str, str]] = None
+        self._back: Optional[Dict[str, str]] = None
+        # Specialize the per-letter lookups by baking each table into a
+        # generated function body: the literal dict becomes a constant of
+        # the code object, so calls skip the attribute loads on ``self``
+        # and the ``reverse`` branch.
+        self._fwd_fn = _compile_lookup(self._fwd)
+        self._bwd_fn = None
+        self._version += 1
+
+    def _table(self, reverse: bool = False) -> bytes:
+        """The 26-byte table for the given direction, building the
+        inverse lazily."""
+
+        if not reverse:
+            return self._fwd
+        if self._bwd is None:
+            bwd = bytearray(26)
+            for i, b in enumerate(self._fwd):
+                bwd[b - 97] = 97 + i
+            self._bwd = bytes(bwd)
+        return self._bwd
+
+    @property
+    def back(self) -> Dict[str, str]:
+        """Reverse mapping, the inverse of :attr:`front`."""
+
+        if self._back is None:
+            self._back = dict(zip(ascii_lowercase, self._table(True).decode()))
+        return self._back
+
+    def __call__(self, value: str, reverse: bool = False) -> str:
+        if reverse:
+            if self._bwd_fn is None:
+                self._bwd_fn = _compile_lookup(self._table(True))
+            return self._bwd_fn(value)
+        return self._fwd_fn(value)
+
+
+#: Standard plugboard wiring, precomputed at import so that default
+#: construction is O(1) and instances share the same objects.
+_STD_FWD = Plugboard._std_front.encode()
+_STD_FWD_FN = _compile_lookup(_STD_FWD)
+
+
+class FrozenPlugboard(Plugboard):
+    """A :class:`Plugboard` whose wiring is fixed at construction.
+
+    Used for the shared default layer stack: because a frozen layer can
+    never change (its ``_version`` stays at 0), machines built on it can
+    reuse precomputed tables unconditionally and nothing needs to copy
+    it defensively.
+    """
+
+    __slots__ = ('_frozen',)
+
+    def __init__(self,
+                 front: Optional[Union[str, Dict[str, str]]] = None) -> None:
+        self._frozen = False
+        super().__init__(front)
+        self._frozen = True
+
+    @Plugboard.front.setter
+    def front(self, value: Union[str, Dict[str, str]]) -> None:
+        if self._frozen:
+            raise AttributeError('frozen plugboard wiring cannot be changed')
+        Plugboard.front.fset(self, value)
+
+
+class Enigma:
+    """A stack of :class:`Layer` objects traversed in a configurable
+    order.  Calling the machine with a letter runs it through every layer
+    in ``order``; an entry ``(i, reverse)`` applies ``layers[i]`` in the
+    given direction.
+    """
+
+    __slots__ = ('_layers', '_order', '_order_flat', '_order_mv', '_trans',
+                 '_trans_versions', '_lut256', '_lut256_versions',
+                 '_composed', '_composed_versions', '_fast')
+
+    _std_layers: Tuple[Layer, ...] = (FrozenPlugboard(),)
+    _std_order: Tuple[Tuple[int, bool], ...] = ((0, False),)
+    #: Composed LUT of the standard machine, filled in at module import.
+    _std_composed: Optional[bytes] = None
+
+    def __init__(self,
+                 layers: Optional[Tuple[Layer, ...]] = None,
+                 order: Optional[Tuple[Tuple[int, bool], ...]] = None) -> None:
+        std = layers is None and order is None
+        if layers is None:
+            layers = self._std_layers
+        if order is None:
+            order = self._std_order
+        layers = tuple(layers)
+        order = tuple((i, bool(r)) for i, r in order)
+        for i, _ in order:
+            if not 0 <= i < len(layers):
+                raise IndexError(f'order refers to missing layer {i}')
+        self._layers = layers
+        self._order = order
+        # Flat unboxed copy of ``order`` for the hot loop --
+        # (index, reverse) pairs interleaved in one array.array, read
+        # through a memoryview so each step is two C-level int fetches
+        # with no tuple unpacking.
+        self._order_flat = array('b', (v for pair in order
+                                       for v in (pair[0], int(pair[1]))))
+        self._order_mv = memoryview(self._order_flat)
+        self._trans: Optional[Dict[int, int]] = None
+        self._trans_versions: Optional[Tuple[int, ...]] = None
+        self._lut256 = None
+        self._lut256_versions: Optional[Tuple[int, ...]] = None
+        self._composed: Optional[bytes] = None
+        self._composed_versions: Optional[Tuple[int, ...]] = None
+        # The default stack is frozen, so its precomputed composed table
+        # can be shared unconditionally.
+        if std and self._std_composed is not None:
+            self._composed = self._std_composed
+            self._composed_versions = (0,)
+        # A fully frozen stack can never be rewired, so the per-letter
+        # call specializes to a closure over the composed table, with no
+        # version check left on the hot path.
+        self._fast = None
+        if layers and all(isinstance(l, FrozenPlugboard) for l in layers):
+            self._fast = (lambda v, _lut=self._composed_lut():
+                          chr(_lut[ord(v) - 97]))
+
+    @property
+    def layers(self) -> Tuple[Layer, ...]:
+        return self._layers
+
+    @property
+    def order(self) -> Tuple[Tuple[int, bool], ...]:
+        return self._order
+
+    def __call__(self, value: str) -> str:
+        # The stack is a fixed permutation, so a lowercase letter needs
+        # just one probe of the fused table, no matter how many layers
+        # deep the machine is.
+        if (len(value) == 1 and value.isascii() and value.islower()
+                and value.isalpha()):
+            if self._fast is not None:
+                return self._fast(value)
+            return chr(self._composed_lut()[ord(value) - 97])
+        return self._walk(value)
+
+    def _walk(self, value: str) -> str:
+        """Run ``value`` through every layer in order, one call per
+        step.  The general path; also what the fused tables are built
+        from."""
+
+        layers = self._layers
+        mv = self._order_mv
+        for k in range(0, len(mv), 2):
+            value = layers[mv[k]](value, bool(mv[k + 1]))
+        return value
+
+    def _translation(self) -> Dict[int, int]:
+        """Translation table for the composed layer stack.
+
+        The stack is a fixed permutation of the alphabet, so the whole
+        machine collapses into a single :func:`str.maketrans` table.  The
+        table is built lazily and rebuilt whenever a layer's wiring
+        changes (tracked through :attr:`Layer._version`).
+        """
+
+        versions = tuple(layer._version for layer in self._layers)
+        if self._trans is None or versions != self._trans_versions:
+            composed = {c: self._walk(c) for c in ascii_lowercase}
+            self._trans = str.maketrans(composed)
+            self._trans_versions = versions
+        return self._trans
+
+    def encrypt(self, text: str) -> str:
+        """Encrypt a whole string in one pass.
+
+        Equivalent to calling the machine once per character, but the
+        composed translation table lets :meth:`str.translate` do the work
+        in a single C-level loop.  Characters outside the lowercase
+        alphabet are left untouched.
+        """
+
+        return text.translate(self._translation())
+
+    def _byte_lut(self) -> 'np.ndarray':
+        """256-entry ``np.uint8`` table for the composed layer stack.
+
+        Same contents as :meth:`_translation`, extended to the identity
+        on bytes outside ``a``..``z``, and cached under the same version
+        scheme.
+        """
+
+        versions = tuple(layer._version for layer in self._layers)
+        if self._lut256 is None or versions != self._lut256_versions:
+            lut = np.arange(256, dtype=np.uint8)
+            for c in ascii_lowercase:
+                lut[ord(c)] = ord(self._walk(c))
+                lut[ord(c) - 32] = ord(self._walk(c)) - 32
+            self._lut256 = lut
+            self._lut256_versions = versions
+        return self._lut256
+
+    def _composed_lut(self) -> bytes:
+        """The whole stack composed into a single 26-byte table, cached
+        under the usual version scheme."""
+
+        versions = tuple(layer._version for layer in self._layers)
+        if self._composed is None or versions != self._composed_versions:
+            self._composed = bytes(ord(self._walk(c))
+                                   for c in ascii_lowercase)
+            self._composed_versions = versions
+        return self._composed
+
+    def encrypt_bytes(self, buf: bytes) -> bytes:
+        """Encrypt a whole byte string in one vectorized pass.
+
+        Uppercase letters are encrypted with their case preserved and
+        other bytes pass through unchanged.  Uses the fastest native
+        kernel that has been built and is supported by the CPU (see
+        :mod:`._native`), otherwise a NumPy fancy-indexing gather
+        through the 256-entry table; either way the hot loop runs in C
+        and is bound by memory, not the interpreter.
+        """
+
+        if _native.encrypt is not None:
+            return _native.encrypt(buf, self._composed_lut())
+        if np is None:
+            raise ImportError(
+                'encrypt_bytes requires numpy or the native library')
+        return self._byte_lut()[np.frombuffer(buf, np.uint8)].tobytes()
+
+
+Enigma._std_composed = Enigma()._composed_lut()
@@ -0,0 +1,131 @@
+"""Equivalence and cache-invalidation tests.
+
+Every fast path -- the fused LUT in ``__call__``, ``encrypt``,
+``encrypt_bytes`` and each native kernel binding -- must agree with the
+plain per-layer walk, and every cached table must be rebuilt when a
+plugboard is rewired.  Run with ``python -m unittest discover`` from
+the repository root; native kernels are exercised only when their
+libraries have been built (``make native``).
+"""
+
+import unittest
+from string import ascii_lowercase
+
+from src import Enigma, FrozenPlugboard, Layer, Plugboard
+from src import _native
+
+ALL_BYTES = bytes(range(256))
+
+
+def reference_bytes(machine, buf):
+    """Byte-for-byte reference for the batch paths: walk every letter
+    through the stack, preserve case, pass other bytes through."""
+
+    out = bytearray()
+    for b in buf:
+        c = chr(b)
+        if c.isascii() and c.isalpha():
+            r = machine._walk(c.lower())
+            out.append(ord(r) if c.islower() else ord(r) - 32)
+        else:
+            out.append(b)
+    return bytes(out)
+
+
+class CallTest(unittest.TestCase):
+
+    def test_fast_path_matches_walk(self):
+        for machine in (Enigma(),
+                        Enigma(order=((0, False), (0, True))),
+                        Enigma(layers=(Plugboard(),))):
+            for c in ascii_lowercase:
+                self.assertEqual(machine(c), machine._walk(c))
+
+    def test_non_letter_input_takes_the_walk(self):
+        e = Enigma()
+        for value in ('A', '!', 'é', 'ab', ''):
+            self.assertIsNone(e(value))
+
+    def test_custom_layer_subclass(self):
+        class Rot1(Layer):
+            __slots__ = ()
+
+            def __call__(self, value, reverse=False):
+                d = -1 if reverse else 1
+                return chr((ord(value) - 97 + d) % 26 + 97)
+
+        e = Enigma(layers=(Rot1(),), order=((0, False), (0, False)))
+        self.assertEqual(e('a'), 'c')
+        self.assertEqual(e.encrypt('az'), 'cb')
+
+    def test_encrypt_matches_per_char_calls(self):
+        e = Enigma()
+        text = 'hello world'
+        expected = ''.join(e(c) if c.isalpha() else c for c in text)
+        self.assertEqual(e.encrypt(text), expected)
+
+
+class BatchEquivalenceTest(unittest.TestCase):
+
+    def assert_matches_reference(self, fn):
+        for machine in (Enigma(), Enigma(order=((0, False), (0, True)))):
+            lut = machine._composed_lut()
+            self.assertEqual(fn(ALL_BYTES, lut),
+                             reference_bytes(machine, ALL_BYTES))
+
+    @unittest.skipUnless(_native.encrypt_swar, 'native SWAR kernel not built')
+    def test_swar_kernel(self):
+        self.assert_matches_reference(_native.encrypt_swar)
+
+    @unittest.skipUnless(_native.encrypt_avx2, 'AVX2 kernel unavailable')
+    def test_avx2_kernel(self):
+        self.assert_matches_reference(_native.encrypt_avx2)
+
+    @unittest.skipUnless(_native.encrypt_vbmi, 'AVX-512 VBMI kernel '
+                         'unavailable')
+    def test_vbmi_kernel(self):
+        self.assert_matches_reference(_native.encrypt_vbmi)
+
+    def test_encrypt_bytes(self):
+        e = Enigma()
+        try:
+            got = e.encrypt_bytes(ALL_BYTES)
+        except ImportError:
+            self.skipTest('no native kernel built and no numpy')
+        self.assertEqual(got, reference_bytes(e, ALL_BYTES))
+
+
+class InvalidationTest(unittest.TestCase):
+
+    ROT1 = ascii_lowercase[1:] + 'a'
+
+    def test_rewiring_invalidates_cached_tables(self):
+        p = Plugboard()
+        e = Enigma(layers=(p,))
+        self.assertEqual(e('a'), 'z')
+        self.assertEqual(e.encrypt('abc'), 'zph')
+        p.front = self.ROT1
+        self.assertEqual(e('a'), 'b')
+        self.assertEqual(e.encrypt('abc'), 'bcd')
+        try:
+            self.assertEqual(e.encrypt_bytes(b'abc'), b'bcd')
+        except ImportError:
+            pass
+
+    def test_rewiring_invalidates_dict_views(self):
+        p = Plugboard()
+        self.assertEqual(p.front['a'], 'z')
+        self.assertEqual(p.back['z'], 'a')
+        p.front = self.ROT1
+        self.assertEqual(p.front['a'], 'b')
+        self.assertEqual(p.back['b'], 'a')
+        self.assertEqual(p('b', reverse=True), 'a')
+
+    def test_frozen_plugboard_rejects_rewiring(self):
+        with self.assertRaises(AttributeError):
+            Enigma().layers[0].front = self.ROT1
+        self.assertEqual(FrozenPlugboard(self.ROT1)('a'), 'b')
+
+
+if __name__ == '__main__':
+    unittest.main()